@@ -50,6 +50,25 @@ def get_imap_folder(
     )
 
 
+def get_imap_account_key(
+        config: ConfigParser,
+        section: str
+) -> tuple:
+    return tuple(
+        config.get(section, option, fallback='').strip()
+        for option in (
+            'host',
+            'port',
+            'username',
+            'password',
+            'encryption',
+            'encryption_hostname_check',
+            'encryption_certificate_check',
+            'encryption_certificate_ca_file',
+        )
+    )
+
+
 def create_callback_handler(
         config: ConfigParser,
         section: str
@@ -15,6 +15,10 @@
 #
 
 import ssl
+from contextlib import contextmanager
+from threading import Condition, Timer
+from time import monotonic
+from typing import Iterator
 
 from imapclient import IMAPClient
 
@@ -22,11 +26,159 @@ from . import Encryption
 from . import EncryptionCertificateCheck
 
 
+class ImapConnectionPool:
+    """
+    Keeps IMAP connections of an account open for reuse, so that short operations
+    don't have to authenticate a new connection each time.
+    """
+
+    MAX_CONNECTIONS: int = 1
+    """
+    Maximum number of connections held by the pool.
+    The pool is shared by all watchers of an account, so an account uses one IDLE connection per watched folder
+    and a single pooled connection. Fallback fetches for different folders take turns and replace the pooled
+    connection, if they select another folder.
+    """
+
+    SECONDS_TO_KEEP_UNUSED: int = 300
+    """
+    Number of seconds an unused connection is kept open.
+    """
+
+    def __init__(self, connector: 'ImapConnector'):
+        self.__connector = connector
+        self.__condition = Condition()
+        self.__clients: dict[tuple[str, bool], tuple[IMAPClient, float]] = {}
+        self.__in_use = 0
+        self.__timer: Timer | None = None
+
+    @contextmanager
+    def acquire(self, folder: str, readonly: bool = True) -> Iterator[IMAPClient]:
+        """
+        Provides a connection with a selected folder and puts it back into the pool afterwards.
+        If the block raises an exception, the connection is closed instead.
+
+        :param folder: folder to select
+        :param readonly: select the folder read only
+        :return: IMAP client
+        """
+
+        key = (folder, readonly)
+        with self.__condition:
+            while self.__in_use >= self.MAX_CONNECTIONS:
+                self.__condition.wait()
+            self.__in_use += 1
+            entry = self.__clients.pop(key, None)
+
+            # Make room for a new connection by closing the least recently used ones.
+            surplus = []
+            if not entry:
+                while self.__clients and len(self.__clients) + self.__in_use > self.MAX_CONNECTIONS:
+                    lru_key = min(self.__clients, key=lambda k: self.__clients[k][1])
+                    surplus.append(self.__clients.pop(lru_key)[0])
+
+        client = None
+        try:
+            for stale_client in surplus:
+                self.__close(stale_client)
+
+            if entry:
+                client = entry[0]
+                try:
+                    # Make sure the connection is still alive and receives pending mailbox updates.
+                    client.noop()
+                except Exception:
+                    self.__close(client)
+                    client = None
+
+            if not client:
+                client = self.__connector.connect(select_folder=folder, select_folder_readonly=readonly)
+
+            yield client
+
+        except Exception:
+            if client:
+                self.__close(client)
+            with self.__condition:
+                self.__in_use -= 1
+                self.__condition.notify()
+            raise
+
+        with self.__condition:
+            self.__in_use -= 1
+            self.__clients[key] = (client, monotonic())
+            self.__condition.notify()
+            self.__schedule_eviction()
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+
+        with self.__condition:
+            if self.__timer:
+                self.__timer.cancel()
+                self.__timer = None
+            clients = [entry[0] for entry in self.__clients.values()]
+            self.__clients.clear()
+
+        for client in clients:
+            self.__close(client)
+
+    def __schedule_eviction(self):
+        """
+        Start the eviction timer, if it is not running yet.
+        Must be called while holding the lock.
+        """
+
+        if self.__timer or not self.__clients:
+            return
+
+        self.__timer = Timer(self.SECONDS_TO_KEEP_UNUSED, self.__evict)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def __evict(self):
+        """
+        Close connections, that were not used for a while.
+        """
+
+        with self.__condition:
+            self.__timer = None
+            expired_at = monotonic() - self.SECONDS_TO_KEEP_UNUSED
+            expired = [key for key, entry in self.__clients.items() if entry[1] <= expired_at]
+            clients = [self.__clients.pop(key)[0] for key in expired]
+            self.__schedule_eviction()
+
+        for client in clients:
+            self.__close(client)
+
+    @staticmethod
+    def __close(client: IMAPClient):
+        """
+        Log out a client and ignore any errors.
+
+        :param client: IMAP client
+        """
+
+        # noinspection PyBroadException
+        try:
+            client.logout()
+        except Exception:
+            pass
+
+
 class ImapConnector:
     """
     Holds IMAP configuration and provides a connection method.
     """
 
+    SECONDS_TO_TIMEOUT: float = 60
+    """
+    Number of seconds a blocking socket operation may take, before the IMAP command fails.
+    Waiting for IDLE responses is not affected, because the IDLE socket is watched by the event loop.
+    """
+
     def __init__(
             self,
             host: str = 'localhost',
@@ -49,6 +201,16 @@ class ImapConnector:
         self.__encryption_certificate_ca_file = encryption_certificate_ca_file.strip() \
             if encryption_certificate_ca_file else None
         self.__use_uid = use_uid
+        self.__ssl_context: ssl.SSLContext | None = None
+        self.__pool = ImapConnectionPool(self)
+
+    @property
+    def pool(self) -> ImapConnectionPool:
+        """
+        Pool of reusable connections for this account.
+        """
+
+        return self.__pool
 
     def __create_client(self) -> IMAPClient:
         """
@@ -63,10 +225,23 @@ class ImapConnector:
             self.__host,
             port=self.__port,
             ssl=is_ssl,
-            ssl_context=self.__create_ssl_context() if is_ssl else None,
-            use_uid=self.__use_uid
+            ssl_context=self.__get_ssl_context() if is_ssl else None,
+            use_uid=self.__use_uid,
+            timeout=self.SECONDS_TO_TIMEOUT,
         )
 
+    def __get_ssl_context(self) -> ssl.SSLContext | None:
+        """
+        Provides the SSL context for encryption, which is created once and shared by all connections.
+
+        :return: the SSL context or None, if no SSL encryption is used
+        """
+
+        if not self.__ssl_context:
+            self.__ssl_context = self.__create_ssl_context()
+
+        return self.__ssl_context
+
     def __create_ssl_context(self) -> ssl.SSLContext | None:
         """
         Creates a SSL context for encryption.
@@ -106,7 +281,7 @@ class ImapConnector:
 
         if self.__encryption == Encryption.STARTTLS:
             try:
-                client.starttls(ssl_context=self.__create_ssl_context())
+                client.starttls(ssl_context=self.__get_ssl_context())
             except Exception as ex:
                 raise Exception('STARTTLS encryption failed.') from ex
 
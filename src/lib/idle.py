@@ -14,8 +14,11 @@
 # limitations under the License.
 #
 
-from threading import Thread
-from time import time, sleep
+import asyncio
+import logging
+import random
+from time import monotonic
+from typing import Iterator
 
 from imapclient import IMAPClient
 from imapclient.response_types import Envelope
@@ -24,22 +27,57 @@ from . import create_logger
 from .callback import CallbackHandler
 from .connector import ImapConnector
 
+_EXISTS = b'EXISTS'
+_EXPUNGE = b'EXPUNGE'
+_RECENT = b'RECENT'
+
+
+def _iter_status_responses(responses) -> Iterator[tuple[int, bytes]]:
+    """
+    Iterates over status responses like (275, b'EXISTS') and skips any other kind of response.
+
+    :param responses: received IMAP idle responses
+    :return: pairs of number and status
+    """
+
+    for response in responses or ():
+        try:
+            number, status = response
+        except (TypeError, ValueError):
+            continue
+        yield number, status
+
 
 class ImapIdleHandler:
     """
     Opens an IMAP connections, enters IDLE mode and waits for incoming messages.
+    All handlers share the running asyncio event loop. While waiting for IDLE responses, the IMAP socket is watched
+    by the event loop. Other blocking IMAP calls are moved into the default executor.
     see https://imapclient.readthedocs.io/en/2.3.1/advanced.html#watching-a-mailbox-using-idle
     """
 
     MAX_IMAP_ERROR_COUNT: int = 0
     """
-    Maximum number of errors until an IMAP thread is stopped.
+    Maximum number of errors until an IMAP watcher is stopped.
     Set to 0 to run infinitely.
     """
 
-    SECONDS_TO_WAIT_AFTER_ERROR: int = 60
+    SECONDS_TO_WAIT_AFTER_ERROR: int = 2
+    """
+    Number of seconds to wait after an error occurred within the watcher.
+    The wait time is doubled with each consecutive error.
+    Set to 0 to retry immediately.
+    """
+
+    MAX_SECONDS_TO_WAIT_AFTER_ERROR: int = 600
     """
-    Number of seconds to wait after an error occurred within the thread.
+    Maximum number of seconds to wait after consecutive errors.
+    """
+
+    ERROR_WAIT_JITTER: float = 0.2
+    """
+    Relative amount of randomness applied to the wait time after an error,
+    so that several watchers don't reconnect at the same time.
     """
 
     SECONDS_TO_RECONNECT_AFTER: int = 600
@@ -55,6 +93,12 @@ class ImapIdleHandler:
     As defined by the IMAP standard, we should not wait for longer than 30 seconds. 
     """
 
+    MAX_EMPTY_IDLE_CHECKS: int = 3
+    """
+    Maximum number of consecutive IDLE checks, that found the socket readable but received no responses.
+    The connection is renewed afterwards.
+    """
+
     def __init__(
             self,
             name: str,
@@ -70,95 +114,230 @@ class ImapIdleHandler:
         self.__ignoreRecentFlag = ignoreRecentFlag
         self.__logger = create_logger(self.__name)
 
-        # Prepare thread.
-        self.__thread = Thread(target=self.__idle)
-        self.__thread_stopped = False
-        self.__connected_at = None
+        # Prepare task.
+        self.__task: asyncio.Task | None = None
+        self.__stop_event = asyncio.Event()
+        self.__reconnect_at = None
+        self.__message_count: int | None = None
+        self.__pending_message_nrs: list[int] = []
+        self.__empty_idle_checks = 0
         self.__imap_error_count = 0
-        # self.__event = Event()
+        self.__seconds_to_wait_after_error = self.SECONDS_TO_WAIT_AFTER_ERROR
+        self.__attempt_started_at = None
 
     def start(self):
         """
-        Start the thread.
+        Schedule the watcher on the running event loop.
         """
 
-        self.__thread.start()
+        self.__task = asyncio.get_running_loop().create_task(self.__idle(), name=self.__name)
 
     def stop(self):
         """
-        Stop the thread.
+        Stop the watcher.
+        """
+
+        self.__stop_event.set()
+
+    def cancel(self):
+        """
+        Cancel the watcher immediately.
+        A running IMAP command is finished or fails after the socket timeout of the connector,
+        afterwards the connection is closed without LOGOUT.
+        """
+
+        if self.__task:
+            self.__task.cancel()
+
+    async def join(self):
+        """
+        Wait until the watcher is finished.
+        """
+
+        if not self.__task:
+            return
+
+        # Wait without propagating the cancellation of the watcher to the caller.
+        await asyncio.wait((self.__task,))
+        if not self.__task.cancelled():
+            self.__task.result()
+
+    async def __wait_for_stop(self, timeout: float) -> bool:
+        """
+        Wait until the watcher is stopped or the timeout is reached.
+
+        :param timeout: maximum number of seconds to wait
+        :return: True, if the watcher was stopped while waiting
+        """
+
+        try:
+            await asyncio.wait_for(self.__stop_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
+
+    @staticmethod
+    async def __run_blocking(func, *args, on_cancel=None, **kwargs):
+        """
+        Run a blocking call in the executor.
+
+        A running thread can't be interrupted. If the watcher is cancelled meanwhile, we still wait for the call
+        to return, so that a connection is never used by two threads at the same time.
+
+        :param func: function to call
+        :param on_cancel: called with the result of the function, if it succeeded although the watcher was cancelled
+        :return: result of the function
+        """
+
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            await asyncio.wait((future,))
+            if on_cancel and not future.cancelled() and future.exception() is None:
+                on_cancel(future.result())
+            raise
+
+    async def __handle_imap_error(self, ex: Exception, phase: str) -> bool:
+        """
+        Log an IMAP error and wait before the next attempt.
+
+        :param ex: the occurred error
+        :param phase: description of the failed operation
+        :return: True, if the watcher should try again, or False, if too many errors occurred
         """
 
-        self.__thread_stopped = True
+        self.__logger.exception('%s failed. %s', phase, ex)
+
+        if self.MAX_IMAP_ERROR_COUNT > 0:
+            self.__imap_error_count += 1
+            if self.__imap_error_count > self.MAX_IMAP_ERROR_COUNT:
+                self.__logger.warning('Leaving the watcher after %s errors.', self.__imap_error_count)
+                return False
+
+        await self.__wait_after_error()
+        return True
 
-    def join(self):
+    async def __wait_after_error(self):
         """
-        Join the thread.
+        Wait before the next attempt after an error occurred.
+
+        The wait time grows exponentially with consecutive errors and is randomized by ERROR_WAIT_JITTER.
+        Time already spent on the failed attempt is deducted from the wait time.
         """
 
-        self.__thread.join()
+        if self.SECONDS_TO_WAIT_AFTER_ERROR <= 0:
+            return
+
+        seconds = min(
+            self.MAX_SECONDS_TO_WAIT_AFTER_ERROR,
+            self.__seconds_to_wait_after_error * (1 + random.uniform(-self.ERROR_WAIT_JITTER, self.ERROR_WAIT_JITTER))
+        )
+        self.__seconds_to_wait_after_error = min(
+            self.MAX_SECONDS_TO_WAIT_AFTER_ERROR,
+            self.__seconds_to_wait_after_error * 2
+        )
+
+        if self.__attempt_started_at:
+            seconds -= monotonic() - self.__attempt_started_at
+
+        if seconds > 0:
+            self.__logger.info('Waiting %.1f seconds before next attempt.', seconds)
+            await self.__wait_for_stop(seconds)
 
-    def __idle(self):
+    async def __idle(self):
         """
-        The m ain thread function initiates an IMAP connection in an endless loop.
+        The main coroutine initiates an IMAP connection in an endless loop.
 
         As this application runs infinitely as a service and the target IMAP server might be offline temporarily,
-        we want to keep this thread running until the target IMAP server becomes available again.
+        we want to keep this watcher running until the target IMAP server becomes available again.
         """
 
+        stopped = self.__stop_event.is_set
+
         while True:
-            if self.__thread_stopped:
-                self.__logger.info('Thread stopped.')
+            if stopped():
+                self.__logger.info('Watcher stopped.')
                 break
 
+            self.__attempt_started_at = monotonic()
             try:
-                client = self.__connector.connect(
-                    select_folder=self.__folder,
-                    select_folder_readonly=True
-                )
+                client = await self.__run_blocking(self.__connect, on_cancel=self.__shutdown_client)
             except Exception as ex:
-                self.__logger.exception('Connection failed. %s', str(ex))
-
-                # noinspection DuplicatedCode
-                if self.MAX_IMAP_ERROR_COUNT > 0:
-                    self.__imap_error_count += 1
-                    if self.__imap_error_count > self.MAX_IMAP_ERROR_COUNT:
-                        self.__logger.warning('Leaving the thread after %s errors.', self.__imap_error_count)
-                        return
+                if not await self.__handle_imap_error(ex, 'Connection'):
+                    return
 
-                if self.SECONDS_TO_WAIT_AFTER_ERROR > 0:
-                    sleep(self.SECONDS_TO_WAIT_AFTER_ERROR)
-
-                # Trying again.
+                # Trying again, unless the watcher was stopped meanwhile.
                 continue
 
             try:
-                self.__idle_client(client)
+                await self.__idle_client(client)
+            except asyncio.CancelledError:
+                self.__logger.info('Watcher cancelled.')
+                self.__shutdown_client(client)
+                raise
             except Exception as ex:
-                self.__logger.exception('IDLE failed. %s', str(ex))
-
-                # noinspection DuplicatedCode
-                if self.MAX_IMAP_ERROR_COUNT > 0:
-                    self.__imap_error_count += 1
-                    if self.__imap_error_count > self.MAX_IMAP_ERROR_COUNT:
-                        self.__logger.warning('Leaving the thread after %s errors.', self.__imap_error_count)
-                        return
+                # Close the failed connection before waiting for the next attempt.
+                self.__shutdown_client(client)
 
-                if self.SECONDS_TO_WAIT_AFTER_ERROR > 0:
-                    sleep(self.SECONDS_TO_WAIT_AFTER_ERROR)
+                if not await self.__handle_imap_error(ex, 'IDLE'):
+                    return
 
-                # Trying again.
+                # Trying again, unless the watcher was stopped meanwhile.
                 continue
 
-            finally:
+            if stopped():
                 # noinspection PyBroadException
                 try:
-                    if client:
-                        client.logout()
+                    await self.__run_blocking(client.logout)
                 except Exception:
                     pass
+            else:
+                # We are going to reconnect anyway, therefore we close the connection without a LOGOUT.
+                self.__shutdown_client(client)
+
+    @staticmethod
+    def __shutdown_client(client: IMAPClient):
+        """
+        Close the connection of a client without logging out and ignore any errors.
 
-    def __idle_client(self, client: IMAPClient):
+        :param client: IMAP client
+        """
+
+        # noinspection PyBroadException
+        try:
+            client.shutdown()
+        except Exception:
+            pass
+
+    def __connect(self) -> IMAPClient:
+        """
+        Open an IMAP connection and select the watched folder read only.
+        The number of messages in the folder is remembered in order to detect new messages later.
+        Messages received since a previous connection was lost are processed by the next IDLE check.
+
+        :return: IMAP client
+        """
+
+        client = self.__connector.connect()
+
+        try:
+            selected = client.select_folder(self.__folder, readonly=True)
+        except Exception as ex:
+            self.__shutdown_client(client)
+            raise Exception('Folder selection failed.') from ex
+
+        # The untagged responses of SELECT are already evaluated.
+        self.__pop_status_responses(client)
+
+        message_count = selected.get(_EXISTS)
+        if self.__message_count is not None and message_count is not None and message_count > self.__message_count:
+            self.__add_pending_message_numbers(range(self.__message_count + 1, message_count + 1))
+        self.__message_count = message_count
+        return client
+
+    async def __idle_client(self, client: IMAPClient):
         """
         Puts IMAP client into IDLE mode and waits for server messages in an endless loop.
 
@@ -168,171 +347,349 @@ class ImapIdleHandler:
         :param client: IMAP client
         """
 
-        if self.__thread_stopped:
+        log = self.__logger
+        stopped = self.__stop_event.is_set
+
+        if stopped():
             return
 
         # Start IDLE mode
         try:
-            self.__logger.info('Enter IDLE mode.')
-            self.__connected_at = int(time())
-            client.idle()
+            log.info('Enter IDLE mode.')
+            self.__empty_idle_checks = 0
+            await self.__run_blocking(self.__enter_idle, client)
+            self.__reconnect_at = monotonic() + self.SECONDS_TO_RECONNECT_AFTER
         except Exception as ex:
             raise Exception('IDLE mode failed.') from ex
 
         try:
             # self.__logger.info('Connection is now in IDLE mode.')
             while True:
-                if self.__thread_stopped:
+                if stopped():
                     break
 
                 # Enforce reconnection after 10 minutes.
-                if self.SECONDS_TO_RECONNECT_AFTER > 0:
-                    age = int(time()) - self.__connected_at
-                    if age > self.SECONDS_TO_RECONNECT_AFTER:
-                        self.__logger.info('Enforce reconnection.')
-                        break
+                if self.SECONDS_TO_RECONNECT_AFTER > 0 and monotonic() > self.__reconnect_at:
+                    log.info('Enforce reconnection.')
+                    break
 
                 try:
-                    self.__idle_loop(client)
-                    self.__imap_error_count = 0
-                except KeyboardInterrupt:
-                    self.__logger.info('Stopped by keyboard interruption.')
-                    self.__thread_stopped = True
-                    break
+                    await self.__idle_loop(client)
+
+                    # Make sure other watchers get their turn, even if the loop doesn't have to wait.
+                    await asyncio.sleep(0)
+
+                    if not self.__empty_idle_checks:
+                        self.__imap_error_count = 0
+                        self.__seconds_to_wait_after_error = self.SECONDS_TO_WAIT_AFTER_ERROR
                 except Exception as ex:
                     raise Exception('IDLE check failed.') from ex
         finally:
-            # noinspection PyBroadException
-            try:
-                self.__logger.info('Leaving IDLE mode.')
-                client.idle_done()
-            except Exception:
-                pass
+            log.info('Leaving IDLE mode.')
+
+        # A proper DONE is only necessary before LOGOUT, otherwise the connection is closed right away.
+        # noinspection PyBroadException
+        try:
+            if stopped():
+                await self.__run_blocking(client.idle_done)
+        except Exception:
+            pass
 
-    def __idle_loop(self, client: IMAPClient):
+    async def __idle_loop(self, client: IMAPClient):
         """
         Wait for IDLE responses of the server and process the results.
 
         :param client: IMAP client
         """
 
-        responses = client.idle_check(timeout=self.SECONDS_TO_WAIT_FOR_IDLE_RESPONSE)
-        if not responses:
-            return
+        log = self.__logger
 
-        self.__logger.info('Received: %s', str(responses))
-        message_nr = self.__get_new_message_number(responses, self.__ignoreRecentFlag)
-        if not message_nr:
+        message_nrs = self.__pending_message_nrs
+        self.__pending_message_nrs = []
+
+        if not message_nrs:
+            message_nrs = await self.__receive_message_numbers(client)
+        if not message_nrs:
             # self.__logger.info('Ignore message.')
             return
 
-        self.__logger.info('Fetching envelope for message nr %s.', message_nr)
-        envelope = self.__get_message_envelope(message_nr)
-        if not envelope:
-            return
+        log.info('Fetching envelopes for message nrs %s.', message_nrs)
+        message_nrs, envelopes, idle_error = await self.__run_blocking(
+            self.__fetch_message_envelopes, client, message_nrs
+        )
+        if envelopes is None:
+            log.info('Fetching envelopes through a separate connection.')
+            envelopes = await self.__run_blocking(self.__get_message_envelopes, message_nrs)
+
+        for envelope in envelopes:
+            try:
+                self.__callback.trigger_new_message_command(envelope=envelope)
+            except Exception as ex:
+                log.exception('Callback failed. %s', ex)
+
+        # Renew the connection after the received messages were processed.
+        if idle_error:
+            raise Exception('IDLE mode failed.') from idle_error
+
+    async def __receive_message_numbers(self, client: IMAPClient) -> list[int]:
+        """
+        Wait for IDLE responses of the server and detect new messages.
+
+        :param client: IMAP client in IDLE mode
+        :return: numbers of new messages
+        """
+
+        log = self.__logger
+
+        if not await self.__wait_for_idle_response(client):
+            # The socket didn't stay readable, so previous empty checks don't indicate a closed connection.
+            self.__empty_idle_checks = 0
+            return []
+
+        # The socket is readable, therefore the check doesn't need to wait.
+        responses = client.idle_check(timeout=0)
+        if not responses:
+            # A socket, that stays readable without providing any responses, was most likely closed by the server.
+            self.__empty_idle_checks += 1
+            if self.__empty_idle_checks >= self.MAX_EMPTY_IDLE_CHECKS:
+                raise Exception('No IDLE responses readable, the connection was probably closed.')
+            return []
+
+        self.__empty_idle_checks = 0
 
+        if log.isEnabledFor(logging.INFO):
+            log.info('Received: %r', responses)
+
+        return self.__get_new_message_numbers(responses)
+
+    async def __wait_for_idle_response(self, client: IMAPClient) -> bool:
+        """
+        Wait until the server sends data on the IDLE connection.
+
+        Instead of blocking a thread, the socket is registered with the event loop. Waiting ends early,
+        if the watcher is stopped.
+
+        :param client: IMAP client in IDLE mode
+        :return: True, if data is available, or False, if nothing was received in time or the watcher was stopped
+        """
+
+        sock = client.socket()
+        loop = asyncio.get_running_loop()
+        readable = loop.create_future()
+        stopped = asyncio.ensure_future(self.__stop_event.wait())
+
+        loop.add_reader(sock, lambda: readable.done() or readable.set_result(True))
         try:
-            self.__callback.trigger_new_message_command(envelope=envelope)
-        except Exception as ex:
-            self.__logger.exception('Callback failed. %s', str(ex))
+            await asyncio.wait(
+                (readable, stopped),
+                timeout=self.SECONDS_TO_WAIT_FOR_IDLE_RESPONSE,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            return readable.done() and not stopped.done()
+        finally:
+            loop.remove_reader(sock)
+            stopped.cancel()
 
-    @staticmethod
-    def __get_new_message_number(responses, ignoreRecentFlag) -> int | None:
+    def __get_new_message_numbers(self, responses) -> list[int]:
         """
-        Extracts the message number fron an IDLE server response.
+        Extracts the numbers of new messages from an IDLE server response.
 
         Response for new messages should look somehow like
         [(275, b'EXISTS'), (1, b'RECENT')]
 
-        TODO: Not sure, if it is the best possible implementation, maybe the is a better approach.
+        EXISTS announces the new number of messages in the folder. Compared with the previously known number,
+        this provides the new messages - even if the server announces several messages at once.
+        EXPUNGE responses reduce the number of messages in the folder.
+
+        Unless ignoreRecentFlag is set, new messages are only taken into account
+        if the server also sent a RECENT response.
 
         :param responses: received IMAP idle responses
-        :return: extracted message number or None, if nothing usable found
+        :return: numbers of new messages, which might be empty if nothing usable was found
         """
 
+        # Shortcut for the most common response about new messages.
+        if type(responses) is list and len(responses) == 2:
+            first, second = responses
+            if type(first) is tuple and type(second) is tuple and len(first) == 2 and len(second) == 2:
+                if first[1] == _EXISTS and second[1] == _RECENT:
+                    return self.__update_message_count(int(first[0]))
+                if first[1] == _RECENT and second[1] == _EXISTS:
+                    return self.__update_message_count(int(second[0]))
+
+        # Collect EXISTS, EXPUNGE and RECENT responses within a single pass.
+        message_numbers = []
+        has_recent = False
+        for number, status in _iter_status_responses(responses):
+            if status == _EXISTS:
+                message_numbers.extend(self.__update_message_count(int(number)))
+            elif status == _EXPUNGE:
+                if self.__message_count:
+                    self.__message_count -= 1
+            elif status == _RECENT:
+                has_recent = True
+
+        if not self.__ignoreRecentFlag and not has_recent:
+            return []
+
+        return message_numbers
+
+    def __update_message_count(self, message_count: int) -> list[int]:
+        """
+        Remember the number of messages in the folder, as announced by an EXISTS response.
 
-        if ignoreRecentFlag == False:
-            if not (type(responses) is list):
-                return None
-            if len(responses) < 2:
-                return None
+        :param message_count: number of messages in the folder
+        :return: numbers of the messages, that were added since the last known number
+        """
 
-            response1 = responses[0]
-            if not (type(response1) is tuple):
-                return None
-            if len(response1) < 2:
-                return None
+        previous_message_count = self.__message_count
+        self.__message_count = message_count
 
-            response2 = responses[1]
-            if not (type(response2) is tuple):
-                return None
-            if len(response2) < 2:
-                return None
+        if previous_message_count is None:
+            return [message_count]
 
-            if response1[1] == b'EXISTS' and response2[1] == b'RECENT':
-                return response1[0]
+        return list(range(previous_message_count + 1, message_count + 1))
 
-            if response2[1] == b'EXISTS' and response1[1] == b'RECENT':
-                return response2[0]
-        else:
+    def __fetch_message_envelopes(
+            self,
+            client: IMAPClient,
+            message_numbers: list[int],
+    ) -> tuple[list[int], list[Envelope] | None, Exception | None]:
+        """
+        Get envelope data for certain messages through the IDLE connection.
+        The client leaves IDLE mode for the FETCH command and enters IDLE mode again afterwards.
+        Messages announced while leaving IDLE mode are fetched as well. Messages announced during FETCH or while
+        entering IDLE mode again are processed by the next IDLE check.
+
+        Errors of the IDLE mode are returned instead of raised, so that already fetched envelopes are still processed
+        before the connection is renewed.
+
+        :param client: IMAP client in IDLE mode
+        :param message_numbers: message numbers to fetch
+        :return: fetched message numbers,
+                 found message envelopes or None, if the FETCH command failed,
+                 error of the IDLE mode or None, if the client is in IDLE mode again
+        """
 
-            """
-            Trigger the script for new messages that look like
-            [(275, b'EXISTS'))]
-            """
+        try:
+            _, responses = client.idle_done()
+        except Exception as ex:
+            return message_numbers, None, ex
 
-            if not (type(responses) is list):
-                return None
-            if len(responses) < 1:
-                return None
+        # imaplib keeps the responses of idle_done() as well, they must not be counted twice.
+        self.__pop_status_responses(client)
+        message_numbers = list(dict.fromkeys(message_numbers + self.__get_new_message_numbers(responses)))
 
-            response1 = responses[0]
-            if not (type(response1) is tuple):
-                return None
-            if len(response1) < 2:
-                return None
+        envelopes = None
+        try:
+            envelopes = self.__get_envelopes_from_result(client.fetch(message_numbers, ['ENVELOPE']), message_numbers)
+        except Exception as ex:
+            self.__logger.exception('Fetching envelopes failed. %s', ex)
 
-            if response1[1] == b'EXISTS':
-                return response1[0]
+        try:
+            self.__enter_idle(client)
+            self.__reconnect_at = monotonic() + self.SECONDS_TO_RECONNECT_AFTER
+        except Exception as ex:
+            return message_numbers, envelopes, ex
 
-        return None
+        return message_numbers, envelopes, None
 
-    def __get_message_envelope(self, message_number) -> Envelope | None:
+    def __enter_idle(self, client: IMAPClient):
         """
-        Get envelope data for a certain message.
-        We are using a separate client connection in order to keep the IDLE connection untouched.
+        Put the client into IDLE mode.
+
+        Unlike IMAPClient.idle(), untagged responses sent by the server before it accepts the IDLE command are not
+        treated as an error. Together with the untagged responses of previous commands, they are checked for new
+        messages, which are processed by the next IDLE check.
 
-        :param message_number: message number to fetch
-        :return: message envelope or None, if not found
+        :param client: IMAP client, that is not in IDLE mode
         """
 
-        client = None
+        # The capabilities are cached by the client, they can't be requested during IDLE mode.
+        if not client.has_capability('IDLE'):
+            raise Exception('IDLE mode is not supported by the server.')
+
+        # noinspection PyProtectedMember
+        imap = client._imap
         try:
-            client = self.__connector.connect(
-                select_folder=self.__folder,
-                select_folder_readonly=True
-            )
+            # noinspection PyProtectedMember
+            client._idle_tag = tag = imap._command('IDLE')
+
+            # imaplib returns None for the continuation request and keeps untagged responses on its own.
+            # noinspection PyProtectedMember
+            while imap._get_response() is not None:
+                result = imap.tagged_commands.get(tag)
+                if result:
+                    raise Exception('IDLE command rejected. %s %s' % result)
+        finally:
+            self.__add_pending_message_numbers(self.__get_new_message_numbers(self.__pop_status_responses(client)))
+
+    def __add_pending_message_numbers(self, message_numbers):
+        """
+        Remember new messages, that are processed by the next IDLE check.
+
+        :param message_numbers: numbers of new messages
+        """
+
+        self.__pending_message_nrs = list(dict.fromkeys(self.__pending_message_nrs + list(message_numbers)))
+
+    @staticmethod
+    def __pop_status_responses(client: IMAPClient) -> list[tuple[int, bytes]]:
+        """
+        Remove status responses from the untagged responses, that imaplib collected during previous commands.
+        Unsolicited EXISTS responses are not returned by IMAPClient, unless the client is in IDLE mode.
+
+        :param client: IMAP client
+        :return: status responses like (275, b'EXISTS'), expunged messages first
+        """
+
+        responses = []
+        for status in (_EXPUNGE, _EXISTS, _RECENT):
+            # noinspection PyProtectedMember
+            _, numbers = client._imap.response(status.decode())
+            responses.extend((int(number), status) for number in numbers if number)
+        return responses
 
-            result = client.fetch([message_number], ['ENVELOPE'])
+    def __get_message_envelopes(self, message_numbers: list[int]) -> list[Envelope]:
+        """
+        Get envelope data for certain messages with a single FETCH command.
+        This is a fallback, if fetching through the IDLE connection failed. We are using a pooled client connection
+        in order to keep the IDLE connection untouched.
+
+        :param message_numbers: message numbers to fetch
+        :return: found message envelopes
+        """
+
+        try:
+            with self.__connector.pool.acquire(folder=self.__folder) as client:
+                result = client.fetch(message_numbers, ['ENVELOPE'])
+
+        except Exception as ex:
+            self.__logger.exception('Pooled IMAP connection failed. %s', ex)
+            return []
+
+        return self.__get_envelopes_from_result(result, message_numbers)
+
+    def __get_envelopes_from_result(self, result: dict, message_numbers: list[int]) -> list[Envelope]:
+        """
+        Extracts envelopes from the result of a FETCH command.
+
+        :param result: FETCH result
+        :param message_numbers: fetched message numbers
+        :return: found message envelopes
+        """
+
+        envelopes = []
+        for message_number in message_numbers:
             if message_number not in result:
                 self.__logger.warning('No data found for message nr %s.', message_number)
-                return None
+                continue
 
             message_result = result[message_number]
             if b'ENVELOPE' not in message_result:
                 self.__logger.warning('No envelope data found for message nr %s.', message_number)
-                return None
-
-            return message_result[b'ENVELOPE']
+                continue
 
-        except Exception as ex:
-            self.__logger.exception('Separate IMAP connection failed. %s', str(ex))
-            return None
+            envelopes.append(message_result[b'ENVELOPE'])
 
-        finally:
-            # noinspection PyBroadException
-            try:
-                if client:
-                    client.logout()
-            except Exception:
-                pass
+        return envelopes
@@ -14,15 +14,55 @@
 # limitations under the License.
 #
 
+import asyncio
+import signal
+
 from lib import root_logger
 from lib.callback import CallbackHandler
 from lib.config import get_config, \
     create_imap_connector, \
     create_imap_idle_handler, \
-    create_callback_handler
+    create_callback_handler, \
+    get_imap_account_key
 from lib.connector import ImapConnector
 from lib.idle import ImapIdleHandler
 
+
+async def watch(handlers: list[ImapIdleHandler], connectors: list[ImapConnector]):
+    """
+    Runs all IMAP IDLE handlers concurrently within a single event loop.
+    The handlers are stopped on SIGINT or SIGTERM. A second signal cancels them immediately.
+
+    :param handlers: IMAP IDLE handlers to run
+    :param connectors: IMAP connectors used by the handlers, their pooled connections are closed at the end
+    """
+
+    stopping = False
+
+    def on_signal():
+        nonlocal stopping
+        for h in handlers:
+            if stopping:
+                h.cancel()
+            else:
+                h.stop()
+        stopping = True
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, on_signal)
+
+    for handler in handlers:
+        handler.start()
+
+    try:
+        await asyncio.gather(*(handler.join() for handler in handlers))
+    finally:
+        # Connectors might be shared by several handlers, therefore the pools are closed after all handlers are done.
+        for connector in connectors:
+            await asyncio.to_thread(connector.pool.close)
+
+
 if __name__ == '__main__':
     config = get_config(logger=root_logger)
     if not config:
@@ -33,16 +73,25 @@ if __name__ == '__main__':
         root_logger.warning('No IMAP servers configured. Nothing to do.')
         exit(0)
 
+    # Mailboxes of the same account share their connector,
+    # so that the SSL context and the connection pool are reused.
+    connectors: dict[tuple, ImapConnector] = {}
+
+    handlers: list[ImapIdleHandler] = []
     for section in sections:
         callback: CallbackHandler = create_callback_handler(
             config=config,
             section=section,
         )
 
-        connector: ImapConnector = create_imap_connector(
-            config=config,
-            section=section,
-        )
+        account_key = get_imap_account_key(config=config, section=section)
+        connector: ImapConnector | None = connectors.get(account_key)
+        if not connector:
+            connector = create_imap_connector(
+                config=config,
+                section=section,
+            )
+            connectors[account_key] = connector
 
         handler: ImapIdleHandler = create_imap_idle_handler(
             config=config,
@@ -51,5 +100,6 @@ if __name__ == '__main__':
             callback=callback,
         )
 
-        handler.start()
-        # handler.join()
+        handlers.append(handler)
+
+    asyncio.run(watch(handlers, list(connectors.values())))